@@ -0,0 +1,215 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Binary, memory-mapped event store for arrival logs
+#
+# P1_c.py and Problem_7/simulation.py re-parse the CSV timestamps with
+# pd.to_datetime on every run. Here the log is converted once into a folder of
+# .npy arrays:
+#
+#   <store>/timestamps.npy   int64 nanoseconds since the epoch, sorted
+#   <store>/<column>.npy     one array per value column (e.g. revenue)
+#   <store>/index.npy        offsets[i] = first event at or after origin + i * bucket
+#   <store>/meta.json        column names, origin and bucket size
+#
+# Opening a store only maps the files (np.load with mmap_mode='r'), and a
+# time-window query is two index lookups plus a searchsorted inside the
+# matching buckets, returning slices that are views of the mapped arrays.
+
+BUCKET_SECONDS = {"hour": 3600, "day": 86400}
+NS_PER_SECOND = 1_000_000_000
+
+
+def _to_ns(t):
+    """Converts a timestamp-like value (str, datetime, pd.Timestamp, int ns) to int64 ns."""
+    if isinstance(t, (int, np.integer)):
+        return int(t)
+    return pd.Timestamp(t).value
+
+
+def _mappable_array(name, values):
+    """
+    Converts a column to an array np.load can memory-map: numeric, bool and
+    datetime columns pass through, strings become fixed-width unicode.
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in "biufcmMU":
+        return values
+    if values.dtype.kind in "OS":
+        items = values.tolist()
+        if all(isinstance(item, (str, bytes)) or pd.isna(item) for item in items):
+            # Missing entries become empty strings, like an empty CSV field
+            text = ["" if pd.isna(item) else item.decode() if isinstance(item, bytes) else item
+                    for item in items]
+            return np.array(text, dtype=str)
+    raise ValueError(
+        f"Column '{name}' has dtype {values.dtype}, which can't be memory-mapped; "
+        "only numeric, boolean, datetime and text columns are supported"
+    )
+
+
+def write_event_store(store_path, timestamps_ns, columns=None, bucket="hour"):
+    """
+    Writes a store from an int64 array of epoch nanoseconds and an optional
+    dict {name: array} of value columns (same length). Events are sorted by time.
+    Text columns (e.g. agent or call type) are stored as fixed-width unicode so
+    they can still be memory-mapped; any other object column is rejected before
+    anything is written.
+    """
+    if bucket not in BUCKET_SECONDS:
+        raise ValueError(f"bucket must be one of {list(BUCKET_SECONDS)}, got '{bucket}'")
+    columns = {} if columns is None else dict(columns)
+
+    timestamps_ns = np.asarray(timestamps_ns, dtype=np.int64)
+    for name, values in columns.items():
+        if len(values) != len(timestamps_ns):
+            raise ValueError(f"Column '{name}' has {len(values)} values, expected {len(timestamps_ns)}")
+        if name in ("timestamps", "index"):
+            raise ValueError(f"'{name}' is reserved and can't be used as a column name")
+        columns[name] = _mappable_array(name, values)
+
+    order = np.argsort(timestamps_ns, kind="stable")
+    timestamps_ns = timestamps_ns[order]
+
+    bucket_ns = BUCKET_SECONDS[bucket] * NS_PER_SECOND
+    if timestamps_ns.size > 0:
+        origin = (timestamps_ns[0] // bucket_ns) * bucket_ns
+        n_buckets = int((timestamps_ns[-1] - origin) // bucket_ns) + 1
+    else:
+        origin, n_buckets = 0, 0
+    edges = origin + bucket_ns * np.arange(n_buckets + 1, dtype=np.int64)
+    offsets = np.searchsorted(timestamps_ns, edges, side="left").astype(np.int64)
+
+    os.makedirs(store_path, exist_ok=True)
+    np.save(os.path.join(store_path, "timestamps.npy"), timestamps_ns)
+    np.save(os.path.join(store_path, "index.npy"), offsets)
+    for name, values in columns.items():
+        np.save(os.path.join(store_path, f"{name}.npy"), values[order])
+
+    meta = {
+        "columns": list(columns),
+        "bucket": bucket,
+        "origin_ns": int(origin),
+        "n_events": int(timestamps_ns.size),
+    }
+    with open(os.path.join(store_path, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+
+class EventStore:
+    """
+    Read-only view of a store written by write_event_store.
+    All arrays are memory-mapped, so opening is instant regardless of size.
+    """
+
+    def __init__(self, store_path):
+        with open(os.path.join(store_path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.path = store_path
+        self.columns = meta["columns"]
+        self.bucket = meta["bucket"]
+        self.origin_ns = meta["origin_ns"]
+        self.bucket_ns = BUCKET_SECONDS[self.bucket] * NS_PER_SECOND
+
+        self.timestamps = np.load(os.path.join(store_path, "timestamps.npy"), mmap_mode="r")
+        self.offsets = np.load(os.path.join(store_path, "index.npy"), mmap_mode="r")
+        self.values = {
+            name: np.load(os.path.join(store_path, f"{name}.npy"), mmap_mode="r")
+            for name in self.columns
+        }
+
+    def __len__(self):
+        return self.timestamps.shape[0]
+
+    def _position(self, t_ns):
+        """Index of the first event with timestamp >= t_ns, using the bucket index."""
+        n_buckets = self.offsets.shape[0] - 1
+        b = (t_ns - self.origin_ns) // self.bucket_ns
+        if b < 0:
+            return 0
+        if b >= n_buckets:
+            return len(self)
+        lo, hi = int(self.offsets[b]), int(self.offsets[b + 1])
+        return lo + int(np.searchsorted(self.timestamps[lo:hi], t_ns, side="left"))
+
+    def window_slice(self, start=None, end=None):
+        """Python slice of the events with start <= t < end (None = open end)."""
+        i = 0 if start is None else self._position(_to_ns(start))
+        j = len(self) if end is None else self._position(_to_ns(end))
+        return slice(i, max(i, j))
+
+    def window(self, start=None, end=None):
+        """
+        Events with start <= t < end, as (timestamps_ns, {column: values}).
+        Both are zero-copy views of the memory-mapped arrays.
+        """
+        s = self.window_slice(start, end)
+        return self.timestamps[s], {name: values[s] for name, values in self.values.items()}
+
+    def bucket_counts(self):
+        """Number of events in each hour/day bucket, straight from the index."""
+        return np.diff(self.offsets)
+
+    def to_dataframe(self, start=None, end=None):
+        """Copies a window into a DataFrame with the same layout as the CSV files."""
+        timestamps_ns, values = self.window(start, end)
+        df = pd.DataFrame({"timestamp": pd.to_datetime(np.asarray(timestamps_ns), unit="ns")})
+        for name, column in values.items():
+            df[name] = np.asarray(column)
+        return df
+
+
+def csv_to_event_store(csv_path, store_path, time_column="timestamp", bucket="hour"):
+    """
+    Converts one of the arrival CSVs (timestamp column + optional value columns
+    like revenue) into a store. This is the only place the text gets parsed.
+    """
+    df = pd.read_csv(csv_path)
+    # Fixed format parsing is much faster than letting pandas guess per row
+    timestamps = pd.to_datetime(df[time_column], format="ISO8601")
+    timestamps_ns = timestamps.to_numpy(dtype="datetime64[ns]").view(np.int64)
+    columns = {name: df[name].to_numpy() for name in df.columns if name != time_column}
+    write_event_store(store_path, timestamps_ns, columns, bucket=bucket)
+    return EventStore(store_path)
+
+
+def event_store_to_csv(store, csv_path, start=None, end=None):
+    """Writes (a window of) a store back to the CSV layout."""
+    if not isinstance(store, EventStore):
+        store = EventStore(store)
+    store.to_dataframe(start, end).to_csv(csv_path, index=False)
+
+
+def open_or_convert(csv_path, store_path=None, bucket="hour"):
+    """
+    Opens the store next to csv_path, converting the CSV first if the store
+    is missing or older than the CSV.
+    """
+    if store_path is None:
+        store_path = os.path.splitext(csv_path)[0] + ".events"
+    meta_path = os.path.join(store_path, "meta.json")
+    if not os.path.exists(meta_path) or os.path.getmtime(meta_path) < os.path.getmtime(csv_path):
+        return csv_to_event_store(csv_path, store_path, bucket=bucket)
+    return EventStore(store_path)
+
+
+# --- Main script execution ---
+if __name__ == "__main__":
+    import time
+
+    start = time.perf_counter()
+    store = open_or_convert("call_center_data.csv")
+    print(f"Opened store with {len(store)} events in {time.perf_counter() - start:.3f} s")
+
+    # One afternoon, without touching the rest of the 30 days
+    ts, values = store.window("2025-09-15 12:00", "2025-09-15 18:00")
+    print(f"Calls between 12:00 and 18:00 on 2025-09-15: {ts.size}")
+    print(f"Revenue in that window: ${values['revenue'].sum():.2f}")
+
+    # Inter-arrival times in minutes for the whole log, without pd.to_datetime
+    inter_arrival = np.diff(store.timestamps) / (60 * NS_PER_SECOND)
+    print(f"Mean inter-arrival time: {inter_arrival.mean():.4f} mins")
+    print(f"Busiest hour had {store.bucket_counts().max()} calls")
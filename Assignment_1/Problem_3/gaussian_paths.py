@@ -0,0 +1,180 @@
+import functools
+
+import numpy as np
+
+# Fast stationary Gaussian process paths by circulant embedding
+#
+# dummy_data_set.py builds one GBM path with independent shocks in a Python
+# loop. Volatility and traffic models need correlated noise (fractional
+# Gaussian noise, OU processes, ...), and a Cholesky factor of the n x n
+# covariance matrix costs O(n^3). For a stationary covariance c(k) the
+# covariance matrix is Toeplitz, which can be embedded in a circulant matrix of
+# size m = 2(n - 1). A circulant matrix is diagonalized by the FFT, so
+#
+#   lam = FFT(c_0, ..., c_{n-1}, c_{n-2}, ..., c_1)      (eigenvalues)
+#   Y   = FFT(sqrt(lam / m) * (Z1 + i Z2))
+#
+# gives two independent paths (Re Y and Im Y, first n values) in O(m log m).
+# The eigenvalues only depend on the covariance, so they are computed once and
+# cached for repeated draws.
+
+
+class StationaryGaussianGenerator:
+    """
+    Draws zero-mean paths X_0..X_{n-1} with Cov(X_i, X_j) = cov_func(|i - j|).
+
+    cov_func takes an integer array of lags and returns the autocovariances.
+    If the minimal embedding has negative eigenvalues, the embedding is doubled
+    (up to max_doublings times) by evaluating cov_func at more lags; tiny
+    negative round-off values are set to zero.
+    """
+
+    def __init__(self, cov_func, n, max_doublings=8, tol=1e-10):
+        if n < 2:
+            raise ValueError("n must be at least 2")
+        self.n = n
+        size = n
+        for _ in range(max_doublings + 1):
+            c = np.asarray(cov_func(np.arange(size)), dtype=float)
+            row = np.concatenate([c, c[-2:0:-1]])
+            lam = np.fft.fft(row).real
+            if lam.min() >= -tol * lam.max():
+                break
+            size = 2 * size
+        else:
+            raise ValueError(
+                "Circulant embedding is not non-negative definite; "
+                "this covariance can't be simulated exactly this way"
+            )
+        self.m = row.size
+        self.sqrt_eig = np.sqrt(np.clip(lam, 0.0, None) / self.m)
+
+    def sample(self, n_paths=1, rng=None):
+        """Array of shape (n_paths, n). Each FFT gives two paths (real and imaginary parts)."""
+        rng = np.random.default_rng(rng)
+        n_ffts = (n_paths + 1) // 2
+        Z = rng.standard_normal((n_ffts, self.m)) + 1j * rng.standard_normal((n_ffts, self.m))
+        Y = np.fft.fft(self.sqrt_eig * Z, axis=1)[:, :self.n]
+        paths = np.concatenate([Y.real, Y.imag], axis=0)
+        return paths[:n_paths]
+
+
+# --- Covariance functions ---
+
+def fgn_autocov(H):
+    """Autocovariance of unit-variance fractional Gaussian noise with Hurst index H."""
+    if not 0 < H < 1:
+        raise ValueError("Hurst index H must be in (0, 1)")
+
+    def cov(k):
+        k = np.abs(np.asarray(k, dtype=float))
+        return 0.5 * (np.abs(k + 1)**(2 * H) - 2 * k**(2 * H) + np.abs(k - 1)**(2 * H))
+    return cov
+
+
+def ou_autocov(theta, sigma, dt):
+    """Autocovariance of a stationary OU process sampled every dt: sigma^2/(2 theta) e^(-theta k dt)."""
+    def cov(k):
+        return sigma**2 / (2 * theta) * np.exp(-theta * dt * np.abs(np.asarray(k, dtype=float)))
+    return cov
+
+
+# --- Path generators ---
+
+# Generators are cached by (kind, parameters, n) so repeated draws with the same
+# covariance skip the eigenvalue FFT. The cache is bounded, so sweeping over H
+# or theta doesn't keep an eigenvalue array alive for every value ever used.
+_COV_FUNCS = {"fgn": fgn_autocov, "ou": ou_autocov}
+
+
+@functools.lru_cache(maxsize=16)
+def _cached_generator(kind, params, n):
+    return StationaryGaussianGenerator(_COV_FUNCS[kind](*params), n)
+
+
+def fgn_paths(H, n, n_paths=1, rng=None):
+    """Unit-variance fractional Gaussian noise, shape (n_paths, n)."""
+    gen = _cached_generator("fgn", (H,), n)
+    return gen.sample(n_paths, rng)
+
+
+def fbm_paths(H, n_steps, T=1.0, n_paths=1, rng=None):
+    """
+    Fractional Brownian motion on the grid t_j = j T / n_steps, j = 0..n_steps,
+    shape (n_paths, n_steps + 1). Built as the scaled cumulative sum of fGn
+    (B^H is H-self-similar, so each increment has std (T / n_steps)^H).
+    """
+    increments = fgn_paths(H, n_steps, n_paths, rng) * (T / n_steps)**H
+    zeros = np.zeros((n_paths, 1))
+    return np.concatenate([zeros, np.cumsum(increments, axis=1)], axis=1)
+
+
+def ou_paths(theta, sigma, n, dt, mean=0.0, n_paths=1, rng=None):
+    """Stationary OU paths dX = theta (mean - X) dt + sigma dW at n times, spacing dt."""
+    gen = _cached_generator("ou", (theta, sigma, dt), n)
+    return mean + gen.sample(n_paths, rng)
+
+
+def gbm_paths(S0, mu, sigma, dt, shocks):
+    """
+    Same exponentiation as dummy_data_set.py, vectorized over paths:
+        S_{i+1} = S_i * exp((mu - sigma^2 / 2) dt + sigma sqrt(dt) Z_i)
+    shocks has shape (n_paths, n_steps) and sigma can be a scalar or an array of
+    the same shape (a volatility path). Returns shape (n_paths, n_steps + 1).
+    """
+    shocks = np.atleast_2d(shocks)
+    sigma = np.broadcast_to(sigma, shocks.shape)
+    log_steps = (mu - 0.5 * sigma**2) * dt + sigma * np.sqrt(dt) * shocks
+    log_path = np.concatenate([np.zeros((shocks.shape[0], 1)), np.cumsum(log_steps, axis=1)], axis=1)
+    return S0 * np.exp(log_path)
+
+
+def rough_volatility_paths(S0, mu, sigma0, eta, H, n_steps, T=1.0, n_paths=1, rng=None):
+    """
+    Price paths with rough (fractional) log-volatility:
+        sigma_t = sigma0 * exp(eta B^H_t - eta^2 t^{2H} / 2)
+    (the correction term makes E[sigma_t] = sigma0 for every t), then fed
+    through gbm_paths with independent shocks.
+    Returns (prices, vols), shapes (n_paths, n_steps + 1) and (n_paths, n_steps).
+    """
+    rng = np.random.default_rng(rng)
+    dt = T / n_steps
+    t = np.arange(n_steps) * dt
+    B = fbm_paths(H, n_steps, T, n_paths, rng)[:, :-1]
+    vols = sigma0 * np.exp(eta * B - 0.5 * eta**2 * t**(2 * H))
+    shocks = rng.standard_normal((n_paths, n_steps))
+    return gbm_paths(S0, mu, vols, dt, shocks), vols
+
+
+# --- Main script execution ---
+if __name__ == "__main__":
+    import time
+
+    # 1. Check fGn covariance against theory
+    H = 0.3
+    n = 4096
+    start = time.perf_counter()
+    X = fgn_paths(H, n, n_paths=2000, rng=0)
+    elapsed = time.perf_counter() - start
+    print(f"--- fGn, H = {H}: 2000 paths of length {n} in {elapsed:.3f} s ---")
+    theory = fgn_autocov(H)(np.arange(4))
+    for k in range(4):
+        sample_cov = np.mean(X[:, :n - k] * X[:, k:])
+        print(f"lag {k}: sample cov = {sample_cov:+.4f}, theory = {theory[k]:+.4f}")
+
+    # Second call reuses the cached eigenvalues
+    start = time.perf_counter()
+    fgn_paths(H, n, n_paths=2000, rng=1)
+    print(f"Cached repeat draw: {time.perf_counter() - start:.3f} s")
+
+    # 2. fBm scaling: Var(B^H_T) = T^{2H}
+    B = fbm_paths(0.7, 1000, T=2.0, n_paths=5000, rng=2)
+    print(f"\nfBm H=0.7: Var(B_T) = {B[:, -1].var():.4f}, theory = {2.0**1.4:.4f}")
+
+    # 3. Rough-volatility price paths (same S0 / mu / sigma as dummy_data_set.py)
+    S0, MU_ANNUAL, SIGMA_ANNUAL, TRADING_DAYS = 150.0, 0.15, 0.25, 252
+    prices, vols = rough_volatility_paths(S0, MU_ANNUAL, SIGMA_ANNUAL, eta=1.5, H=0.1,
+                                          n_steps=TRADING_DAYS, n_paths=1000, rng=3)
+    print(f"\nRough vol (H=0.1): mean final price = {prices[:, -1].mean():.2f}, "
+          f"theory S0 e^mu = {S0 * np.exp(MU_ANNUAL):.2f}")
+    print(f"Average realized vol: {vols.mean():.4f}")
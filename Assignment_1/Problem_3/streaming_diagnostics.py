@@ -0,0 +1,342 @@
+import numpy as np
+import pandas as pd
+import scipy.stats as stats
+import matplotlib.pyplot as plt
+
+# Streaming Q-Q plots and goodness-of-fit tests for very large samples
+#
+# P1_c.py, P3_c.py and plot_qq_residuals (Problem_7) call stats.probplot on the
+# whole sample, which keeps every value in memory, sorts all of them and plots
+# every point. P3_c.py also runs Shapiro-Wilk, which is only meant for small n.
+#
+# Here the data is fed in chunks to a KLL quantile sketch. The sketch keeps at
+# most about 3k values no matter how many it has seen, two sketches can be merged,
+# and it answers quantile / rank queries with rank error ~ 1/k. Q-Q plots use a
+# fixed number of points. KS / Anderson-Darling need more precision than a
+# sketch can give at large n, so they are computed on a second pass from an
+# exact histogram of F(x) with a fixed number of bins.
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch (Karnin, Lang & Liberty, 2016).
+
+    Level h stores values that each stand for 2^h original values. When a level
+    gets over capacity it is sorted and every other value (random offset) is
+    promoted to the next level. Higher levels get the largest capacity (k),
+    lower ones shrink by a factor 2/3 per level.
+
+    Also keeps exact count, min, max, mean and variance (Chan's parallel
+    update), which are needed to fit the reference distributions.
+    """
+
+    def __init__(self, k=200, seed=None):
+        if k < 8:
+            raise ValueError("k must be at least 8")
+        self.k = k
+        self.rng = np.random.default_rng(seed)
+        self.levels = [np.empty(0)]
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def _capacity(self, h):
+        depth = len(self.levels) - 1 - h
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _add_moments(self, n, mean, m2):
+        if n == 0:
+            return
+        total = self.n + n
+        delta = mean - self.mean
+        self.m2 += m2 + delta**2 * self.n * n / total
+        self.mean += delta * n / total
+        self.n = total
+
+    def update(self, values):
+        """Adds a chunk of values (any array-like; NaNs are dropped)."""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+        self._add_moments(values.size, values.mean(), ((values - values.mean())**2).sum())
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """Merges another sketch into this one (in place) and returns self."""
+        self._add_moments(other.n, other.mean, other.m2)
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self._compress()
+        return self
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            items = self.levels[h]
+            if items.size > self._capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # With an odd count, one value stays behind at this level
+                keep = items[:items.size % 2]
+                pairs = items[items.size % 2:]
+                offset = self.rng.integers(2)
+                self.levels[h] = keep
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], pairs[offset::2]])
+            h += 1
+
+    def weighted_items(self):
+        """Sorted retained values and their weights (weights sum to n)."""
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(items.size, 2.0**h) for h, items in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        return values[order], weights[order]
+
+    def cdf(self, x):
+        """Approximate fraction of values <= x."""
+        values, weights = self.weighted_items()
+        cum = np.concatenate([[0.0], np.cumsum(weights)])
+        return cum[np.searchsorted(values, x, side="right")] / cum[-1]
+
+    def quantile(self, q):
+        """Approximate q-quantiles (q in [0, 1], scalar or array)."""
+        values, weights = self.weighted_items()
+        cum = np.cumsum(weights) / weights.sum()
+        idx = np.searchsorted(cum, np.asarray(q, dtype=float), side="left")
+        idx = np.clip(idx, 0, values.size - 1)
+        out = values[idx]
+        # The exact extremes are known, so use them for q = 0 and q = 1
+        out = np.where(np.asarray(q) <= 0, self.min, out)
+        out = np.where(np.asarray(q) >= 1, self.max, out)
+        return out
+
+    @property
+    def std(self):
+        return np.sqrt(self.m2 / self.n) if self.n > 0 else np.nan
+
+    def rank_error(self):
+        """Approximate normalized rank error of a single query (~99% confidence)."""
+        return 2.296 / self.k**0.9
+
+    def size(self):
+        """Number of values actually stored."""
+        return sum(items.size for items in self.levels)
+
+
+def sketch_from_chunks(chunks, k=200, seed=None):
+    """Builds a sketch from an iterable of arrays."""
+    sketch = KLLSketch(k=k, seed=seed)
+    for chunk in chunks:
+        sketch.update(chunk)
+    return sketch
+
+
+def interarrival_chunks(csv_path, time_column="timestamp", chunksize=1_000_000):
+    """
+    Yields inter-arrival times (minutes) from a sorted arrival CSV, one chunk at
+    a time. The last timestamp of each chunk is carried over to the next one.
+    """
+    last = None
+    for df in pd.read_csv(csv_path, usecols=[time_column], chunksize=chunksize):
+        t_ns = pd.to_datetime(df[time_column], format="ISO8601").to_numpy(dtype="datetime64[ns]").view(np.int64)
+        if last is not None:
+            t_ns = np.concatenate([[last], t_ns])
+        if t_ns.size > 1:
+            yield np.diff(t_ns) / 60e9
+        last = t_ns[-1]
+
+
+# --- Reference distributions fitted from the sketch's exact moments ---
+
+def fitted_distribution(sketch, dist):
+    """Exponential (MLE scale = mean) or normal (MLE mean and std) frozen distribution."""
+    if dist == "expon":
+        return stats.expon(scale=sketch.mean)
+    if dist == "norm":
+        return stats.norm(loc=sketch.mean, scale=sketch.std)
+    raise ValueError(f"dist must be 'expon' or 'norm', got '{dist}'")
+
+
+# Stephens' asymptotic critical values for A^2 when the parameters are estimated
+AD_CRITICAL_VALUES = {
+    "norm": {"levels": [15, 10, 5, 2.5, 1], "values": [0.576, 0.656, 0.787, 0.918, 1.092]},
+    "expon": {"levels": [15, 10, 5, 2.5, 1], "values": [0.922, 1.078, 1.341, 1.606, 1.957]},
+}
+
+
+class ProbabilityHistogram:
+    """
+    Exact counts of u = F(x) in `bins` equal-width bins of [0, 1], for a fixed
+    reference distribution F. Memory is one int64 per bin, and histograms
+    built on different chunks (or machines) can be added together.
+
+    The empirical CDF is known exactly at the bin edges and is taken as linear
+    inside each bin, so KS / Anderson-Darling are off by at most about one bin
+    of probability mass (1 / bins for a good fit).
+    """
+
+    def __init__(self, ref, bins=2**16):
+        self.ref = ref
+        self.bins = bins
+        self.counts = np.zeros(bins, dtype=np.int64)
+
+    @property
+    def n(self):
+        return int(self.counts.sum())
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        idx = np.floor(self.ref.cdf(values) * self.bins).astype(np.int64)
+        self.counts += np.bincount(np.clip(idx, 0, self.bins - 1), minlength=self.bins)
+        return self
+
+    def merge(self, other):
+        if other.bins != self.bins:
+            raise ValueError("Can only merge histograms with the same number of bins")
+        self.counts += other.counts
+        return self
+
+    def _edges_and_cdf(self):
+        edges = np.linspace(0.0, 1.0, self.bins + 1)
+        ecdf = np.concatenate([[0.0], np.cumsum(self.counts)]) / self.counts.sum()
+        return edges, ecdf
+
+    def ks_statistic(self):
+        """
+        sup |F_n(u) - u| at the bin edges, and a bound on how much the true
+        sup over all u can exceed it. Inside a bin both F_n and u are
+        non-decreasing, so comparing with the left edge gives at most the bin's
+        mass over the edge value and comparing with the right edge gives at
+        most the bin width; the bound is max over bins of min(mass, 1 / bins).
+        """
+        edges, ecdf = self._edges_and_cdf()
+        D = np.abs(ecdf - edges).max()
+        return D, np.minimum(self.counts / self.counts.sum(), 1 / self.bins).max()
+
+    def ad_statistic(self):
+        """
+        A^2 = n * integral_0^1 (F_n(u) - u)^2 / (u (1 - u)) du with F_n linear
+        inside each bin, integrated with 4-point Gauss-Legendre per bin.
+        The integrand stays bounded at both ends, so no special cases are needed.
+        """
+        edges, ecdf = self._edges_and_cdf()
+        nodes, node_weights = np.polynomial.legendre.leggauss(4)
+        h = 1.0 / self.bins
+        # u at the Gauss nodes of every bin, shape (bins, 4)
+        t = (nodes + 1) / 2
+        u = edges[:-1, None] + h * t[None, :]
+        Fn = ecdf[:-1, None] + (ecdf[1:] - ecdf[:-1])[:, None] * t[None, :]
+        integrand = (Fn - u)**2 / (u * (1 - u))
+        integral = np.sum(integrand @ node_weights) * h / 2
+        return self.counts.sum() * integral
+
+
+def goodness_of_fit(hist, dist):
+    """
+    KS and Anderson-Darling statistics from a ProbabilityHistogram.
+    A^2 is compared with Stephens' critical values for `dist` with estimated
+    parameters (use a reference fitted with fitted_distribution).
+    """
+    D, D_error = hist.ks_statistic()
+    A2 = hist.ad_statistic()
+    crit = AD_CRITICAL_VALUES[dist]
+    rejected_at = [level for level, value in zip(crit["levels"], crit["values"]) if A2 > value]
+    return {
+        "n": hist.n,
+        "ks_statistic": D,
+        "ks_error_bound": D_error,
+        "ks_sqrt_n": np.sqrt(hist.n) * D,
+        "ad_statistic": A2,
+        "ad_critical_values": dict(zip(crit["levels"], crit["values"])),
+        "ad_rejected_at_levels": rejected_at,
+    }
+
+
+def streaming_goodness_of_fit(make_chunks, dist, k=200, bins=2**16, seed=None):
+    """
+    Two passes over the data:
+      1. KLL sketch + exact moments, used to fit the reference distribution
+         and later for the Q-Q plot
+      2. ProbabilityHistogram of F(x) for the KS / Anderson-Darling statistics
+    make_chunks() must return a fresh iterable of chunks each time it is called.
+    Returns (sketch, ref, result).
+    """
+    sketch = sketch_from_chunks(make_chunks(), k=k, seed=seed)
+    ref = fitted_distribution(sketch, dist)
+    hist = ProbabilityHistogram(ref, bins=bins)
+    for chunk in make_chunks():
+        hist.update(chunk)
+    return sketch, ref, goodness_of_fit(hist, dist)
+
+
+# --- Q-Q plots with a fixed number of points ---
+
+def qq_points(sketch, ref, n_points=200):
+    """Theoretical vs sample quantiles at n_points plotting positions (i - 0.5) / m."""
+    probs = (np.arange(1, n_points + 1) - 0.5) / n_points
+    return ref.ppf(probs), sketch.quantile(probs)
+
+
+def plot_qq(sketch, ref, title, xlabel, ylabel, n_points=200):
+    """Q-Q plot in the same style as the probplot figures, but with n_points points."""
+    theoretical, sample = qq_points(sketch, ref, n_points)
+    plt.figure(figsize=(8, 6))
+    plt.plot(theoretical, sample, "o", markersize=3)
+    lims = [min(theoretical.min(), sample.min()), max(theoretical.max(), sample.max())]
+    plt.plot(lims, lims, "r-", linewidth=1)
+    plt.title(title)
+    plt.xlabel(xlabel)
+    plt.ylabel(ylabel)
+    plt.grid(True)
+    plt.show()
+
+
+# --- Main script execution ---
+if __name__ == "__main__":
+    # 1. Normal residuals: 20 million log-returns in chunks of 1 million
+    sigma_daily = 0.25 / np.sqrt(252)
+
+    def residual_chunks():
+        # Same seed on every call, so both passes see the same data
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            yield rng.normal(0.0005, sigma_daily, size=1_000_000)
+
+    sketch, ref, result = streaming_goodness_of_fit(residual_chunks, "norm", seed=1)
+    print("--- Normality of residuals (20M values, streamed) ---")
+    print(f"Values stored in sketch: {sketch.size()} (rank error ~ {sketch.rank_error():.4f})")
+    print(f"KS statistic D = {result['ks_statistic']:.6f} (+/- {result['ks_error_bound']:.1e})")
+    print(f"Anderson-Darling A^2 = {result['ad_statistic']:.4f}, "
+          f"rejected at levels (%): {result['ad_rejected_at_levels'] or 'none'}")
+    plot_qq(sketch, ref, 'Q-Q Plot of Model Residuals',
+            'Theoretical Quantiles (Normal)', 'Sample Quantiles (Residuals)')
+
+    # 2. Exponential inter-arrival times from the call center log, read in chunks
+    csv_path = "../Problem_1/call_center_data.csv"
+    try:
+        arrivals, ref, result = streaming_goodness_of_fit(
+            lambda: interarrival_chunks(csv_path, chunksize=20_000), "expon", seed=2)
+    except FileNotFoundError:
+        print(f"\n'{csv_path}' not found, skipping the inter-arrival example.")
+    else:
+        print(f"\n--- Exponential fit of {arrivals.n} inter-arrival times ---")
+        print(f"Estimated lambda = {1 / arrivals.mean:.4f} calls/minute")
+        print(f"KS statistic D = {result['ks_statistic']:.6f} (+/- {result['ks_error_bound']:.1e})")
+        print(f"Anderson-Darling A^2 = {result['ad_statistic']:.4f}, "
+              f"rejected at levels (%): {result['ad_rejected_at_levels'] or 'none'}")
+        plot_qq(arrivals, ref,
+                'Q-Q Plot of Inter-arrival Times vs. Exponential Distribution',
+                'Theoretical Quantiles (Exponential)',
+                'Sample Quantiles (Observed Inter-arrival Times)')
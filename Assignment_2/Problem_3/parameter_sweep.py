@@ -0,0 +1,213 @@
+import itertools
+import json
+import os
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+# Resumable parallel parameter sweeps
+#
+# Replaces nested loops like the Tp_candidates loop in main.ipynb. The grid is
+# split into work units, the units are run on a local process pool (most
+# expensive first, so the pool doesn't end up waiting on one long straggler),
+# and every finished point is appended to a JSON-lines results file right away.
+# Running the same sweep again skips every point that is already in the file.
+
+
+def make_grid(**param_values):
+    """
+    Cartesian product of the given parameter values, as a list of dicts.
+    make_grid(lambd=[1, 2], mu=[3]) -> [{'lambd': 1, 'mu': 3}, {'lambd': 2, 'mu': 3}]
+    """
+    names = list(param_values)
+    return [dict(zip(names, values)) for values in itertools.product(*param_values.values())]
+
+
+def point_key(params):
+    """Stable string identifying a grid point (same params -> same key)."""
+    return json.dumps(params, sort_keys=True, default=_to_builtin)
+
+
+def point_seed(params, base_seed=0):
+    """Seed derived from the parameters, so a resumed point gives the same result."""
+    return (zlib.crc32(point_key(params).encode()) + base_seed) % (2**32)
+
+
+def _to_builtin(value):
+    """JSON fallback for numpy scalars and arrays."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def load_finished(results_path):
+    """
+    Reads the results file and returns {point_key: record}.
+    A half-written last line (e.g. the process was killed mid-write) is cut off
+    the file, so the next append starts on a fresh line.
+    """
+    finished = {}
+    if not os.path.exists(results_path):
+        return finished
+    _truncate_partial_line(results_path)
+    with open(results_path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            finished[point_key(record["params"])] = record
+    return finished
+
+
+def _truncate_partial_line(results_path):
+    """Truncates the file back to the end of its last complete line."""
+    with open(results_path, "r+b") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+def _run_unit(func, unit, base_seed):
+    """
+    Runs every point of a work unit inside a worker process.
+    Returns (records, failures); a point that raises is reported in failures
+    as (params, error message) and doesn't stop the rest of the unit.
+    """
+    records = []
+    failures = []
+    for params in unit:
+        np.random.seed(point_seed(params, base_seed))
+        start = time.perf_counter()
+        try:
+            result = func(**params)
+        except Exception as err:
+            failures.append((params, f"{type(err).__name__}: {err}"))
+            continue
+        records.append({
+            "params": params,
+            "result": result,
+            "elapsed": time.perf_counter() - start,
+        })
+    return records, failures
+
+
+def _append_records(results_path, records):
+    """Appends records to the results file and makes sure they hit the disk."""
+    with open(results_path, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, default=_to_builtin) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def run_sweep(func, grid, results_path, n_workers=None, cost_estimate=None,
+              unit_size=1, base_seed=0, verbose=True):
+    """
+    Evaluates func(**params) for every params dict in `grid`.
+
+    func          - top-level (picklable) function returning something JSON-serializable
+    results_path  - append-only JSON-lines file; points already in it are not rerun
+    n_workers     - size of the process pool (default: os.cpu_count())
+    cost_estimate - optional function params -> relative cost; units with the
+                    largest estimated cost are submitted first
+    unit_size     - number of grid points per work unit (bigger units mean
+                    less pool overhead for very cheap points)
+    base_seed     - every point reseeds np.random with point_seed(params, base_seed)
+
+    Returns the list of records (dicts with 'params', 'result', 'elapsed')
+    in the same order as `grid`. If any point fails, every other point is
+    still run and saved, and a RuntimeError listing the failed points is
+    raised at the end (rerunning the sweep only retries those points).
+    """
+    finished = load_finished(results_path)
+    todo = [params for params in grid if point_key(params) not in finished]
+
+    if cost_estimate is not None:
+        todo.sort(key=cost_estimate, reverse=True)
+    units = [todo[i:i + unit_size] for i in range(0, len(todo), unit_size)]
+
+    if verbose:
+        print(f"Sweep: {len(grid)} points, {len(grid) - len(todo)} already done, "
+              f"{len(todo)} to run in {len(units)} work units")
+
+    failures = []
+    if units:
+        done = 0
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            # Submitting in sorted order means the pool starts on the longest units
+            futures = {pool.submit(_run_unit, func, unit, base_seed): unit for unit in units}
+            for future in as_completed(futures):
+                try:
+                    records, unit_failures = future.result()
+                except Exception as err:
+                    # The whole unit was lost (e.g. a worker died or func isn't picklable)
+                    records = []
+                    unit_failures = [(params, f"{type(err).__name__}: {err}")
+                                     for params in futures[future]]
+                if records:
+                    _append_records(results_path, records)
+                for record in records:
+                    finished[point_key(record["params"])] = record
+                failures.extend(unit_failures)
+                done += len(records)
+                if verbose:
+                    print(f"  {done}/{len(todo)} points finished, {len(failures)} failed")
+
+    if failures:
+        lines = "\n".join(f"  {params}: {message}" for params, message in failures)
+        raise RuntimeError(f"{len(failures)} sweep points failed:\n{lines}")
+
+    return [finished[point_key(params)] for params in grid]
+
+
+# --- Example: preventive replacement cost over (alpha, beta, T_p) ---
+
+def simulate_preventive_cost(alpha, beta, T_p, horizon=120.0, trials=1000,
+                             C_fail=5000.0, C_prev=3000.0):
+    """
+    Average cost per month of the preventive replacement policy from main.ipynb,
+    vectorized over trials (a batch of lifetimes is drawn per renewal step).
+    """
+    t = np.zeros(trials)
+    failures = np.zeros(trials)
+    preventives = np.zeros(trials)
+    active = np.ones(trials, dtype=bool)
+    while np.any(active):
+        lifetime = np.random.weibull(alpha, size=active.sum()) * beta
+        used = np.minimum(lifetime, T_p)
+        t[active] += used
+        in_horizon = t[active] <= horizon
+        idx = np.flatnonzero(active)
+        failures[idx] += in_horizon & (lifetime <= T_p)
+        preventives[idx] += in_horizon & (lifetime > T_p)
+        active[idx[~in_horizon]] = False
+    cost_per_month = (failures * C_fail + preventives * C_prev) / horizon
+    return {"cost_per_month": cost_per_month.mean(),
+            "std_error": cost_per_month.std(ddof=1) / np.sqrt(trials)}
+
+
+def preventive_cost_estimate(params):
+    """Rough cost of a point: number of renewal steps ~ horizon / min(T_p, beta)."""
+    return 1.0 / min(params["T_p"], params["beta"])
+
+
+# --- Main script execution ---
+if __name__ == "__main__":
+    grid = make_grid(alpha=[1.5, 2.0, 3.0], beta=[10.0], T_p=list(range(1, 25)))
+    results = run_sweep(simulate_preventive_cost, grid, "preventive_sweep.jsonl",
+                        cost_estimate=preventive_cost_estimate, unit_size=4)
+
+    # Best T_p for each shape parameter
+    for alpha in [1.5, 2.0, 3.0]:
+        rows = [r for r in results if r["params"]["alpha"] == alpha]
+        best = min(rows, key=lambda r: r["result"]["cost_per_month"])
+        print(f"alpha = {alpha}: rough optimal Tp ≈ {best['params']['T_p']} months "
+              f"with cost ₹{best['result']['cost_per_month']:.2f}/month")
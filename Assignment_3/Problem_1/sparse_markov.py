@@ -0,0 +1,216 @@
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+# Sparse backend for large discrete-time Markov chains
+#
+# as3p1.py keeps P as a dense 5x5 array and uses matrix_power, which is fine
+# for 5 states but not for routing / queue chains with 10^4 - 10^6 states.
+# Here P is kept as a CSR matrix the whole time, so memory stays ~ nnz(P).
+
+
+def to_sparse_transition_matrix(P, tol=1e-10):
+    """
+    Converts P (dense array, list of lists or any scipy sparse matrix) to CSR
+    and checks that it is a valid stochastic matrix without densifying it.
+    """
+    P = sp.csr_matrix(P, dtype=float)
+    validate_stochastic(P, tol=tol)
+    return P
+
+
+def validate_stochastic(P, tol=1e-10):
+    """
+    Raises ValueError if P is not square, has NaN / inf or negative entries,
+    or has rows that don't sum to 1 (within tol).
+    """
+    n_rows, n_cols = P.shape
+    if n_rows != n_cols:
+        raise ValueError(f"Transition matrix must be square, got shape {P.shape}")
+
+    # Only the stored non-zeros can be non-finite or negative, so checking
+    # .data is enough
+    if not np.all(np.isfinite(P.data)):
+        raise ValueError("Transition matrix has NaN or infinite entries")
+    if P.nnz > 0 and P.data.min() < -tol:
+        raise ValueError("Transition matrix has negative entries")
+
+    row_sums = np.asarray(P.sum(axis=1)).ravel()
+    bad_rows = np.flatnonzero(~(np.abs(row_sums - 1.0) <= tol))
+    if bad_rows.size > 0:
+        i = bad_rows[0]
+        raise ValueError(
+            f"{bad_rows.size} rows do not sum to 1 (e.g. row {i} sums to {row_sums[i]:.6g})"
+        )
+
+
+def propagate(P, pi0, steps, return_history=False):
+    """
+    Distribution after `steps` transitions: pi_n = pi_0 P^n.
+    Done as repeated sparse vector-matrix products (pi <- pi P), never forming P^n.
+    If return_history is True, also returns an array with pi_0 ... pi_n as rows.
+    """
+    # pi P == (P^T pi^T)^T, and P^T in CSR form gives fast mat-vec products
+    PT = P.T.tocsr()
+    pi = np.asarray(pi0, dtype=float).ravel()
+    if pi.shape[0] != P.shape[0]:
+        raise ValueError(f"pi0 has {pi.shape[0]} entries but P has {P.shape[0]} states")
+
+    history = [pi] if return_history else None
+    for _ in range(steps):
+        pi = PT @ pi
+        if return_history:
+            history.append(pi)
+
+    if return_history:
+        return pi, np.vstack(history)
+    return pi
+
+
+def stationary_distribution(P, method="power", tol=1e-10, max_iter=10000, pi0=None,
+                            pin_state=None):
+    """
+    Solves pi = pi P, sum(pi) = 1 with an iterative method.
+
+    method="power" : power iteration on the lazy chain (I + P) / 2, which also
+                     converges for periodic chains. Stops when the L1 change
+                     between iterates drops below tol.
+    method="gmres" : fixes pi[pin_state] = 1, solves the remaining equations of
+                     (I - P^T) pi = 0 with ILU-preconditioned GMRES and then
+                     normalizes. pin_state must be a recurrent state (pi > 0);
+                     by default it is the most likely state after a few lazy
+                     power steps from the uniform distribution.
+
+    max_iter is the number of single iterations for "power", but the number of
+    restart cycles for "gmres" (scipy's maxiter, 20 inner steps per cycle).
+
+    Returns (pi, info) where info has the number of iterations (single power
+    steps, or inner GMRES steps), the final residual ||pi P - pi||_1 and
+    whether the solver converged.
+    """
+    n = P.shape[0]
+    PT = P.T.tocsr()
+
+    if method == "power":
+        pi = np.full(n, 1.0 / n) if pi0 is None else np.asarray(pi0, dtype=float).ravel()
+        pi = pi / pi.sum()
+        converged = False
+        it = 0
+        for it in range(1, max_iter + 1):
+            pi_next = 0.5 * (pi + PT @ pi)
+            diff = np.abs(pi_next - pi).sum()
+            pi = pi_next
+            if diff < tol:
+                converged = True
+                break
+
+    elif method == "gmres":
+        # Fixing pi[k] = 1 removes the rank deficiency of (I - P^T) and keeps
+        # the reduced system sparse, so an incomplete LU preconditioner is cheap
+        if pin_state is None:
+            # States with pi = 0 lose their mass quickly under the lazy chain,
+            # so the argmax after a few steps is a safe recurrent state
+            guess = np.full(n, 1.0 / n)
+            for _ in range(50):
+                guess = 0.5 * (guess + PT @ guess)
+            k = int(np.argmax(guess))
+        else:
+            k = pin_state
+        keep = np.r_[0:k, k + 1:n]
+        A = (sp.identity(n, format="csr") - PT).tocsc()
+        A_keep = A[keep]
+        A_red = A_keep[:, keep].tocsc()
+        b = -A_keep[:, [k]].toarray().ravel()
+
+        try:
+            ilu = spla.spilu(A_red, drop_tol=1e-6, fill_factor=5)
+        except RuntimeError as err:
+            raise ValueError(
+                f"Reduced system is singular with pin_state={k}; "
+                "pin a recurrent state (one with stationary probability > 0)"
+            ) from err
+        M = spla.LinearOperator(A_red.shape, ilu.solve)
+
+        iterations = [0]
+
+        def count(_):
+            iterations[0] += 1
+
+        x0 = None if pi0 is None else np.delete(np.asarray(pi0, dtype=float).ravel(), k)
+        y, exit_code = spla.gmres(A_red, b, x0=x0, M=M, rtol=tol, maxiter=max_iter,
+                                  callback=count, callback_type="pr_norm")
+        it = iterations[0]
+        converged = exit_code == 0
+        pi = np.insert(y, k, 1.0)
+        # Tiny negative values can show up from round-off
+        pi = np.clip(pi, 0.0, None)
+        pi = pi / pi.sum()
+
+    else:
+        raise ValueError(f"Unknown method '{method}', use 'power' or 'gmres'")
+
+    residual = np.abs(PT @ pi - pi).sum()
+    info = {"iterations": it, "residual": residual, "converged": converged}
+    return pi, info
+
+
+def random_walk_chain(n_states, p):
+    """
+    Builds the sparse transition matrix of a random walk on 0..n_states-1
+    with reflecting barriers (moves right w.p. p, left w.p. 1 - p).
+    Only 2 non-zeros per row, so this is cheap even for 10^6 states.
+    """
+    q = 1 - p
+    rows = np.arange(n_states)
+    right = np.minimum(rows + 1, n_states - 1)
+    left = np.maximum(rows - 1, 0)
+    data = np.concatenate([np.full(n_states, p), np.full(n_states, q)])
+    P = sp.csr_matrix(
+        (data, (np.concatenate([rows, rows]), np.concatenate([right, left]))),
+        shape=(n_states, n_states),
+    )
+    # Duplicate entries at the two barriers get summed by the constructor
+    return P
+
+
+# --- Main script execution ---
+if __name__ == "__main__":
+    # 1. Same customer support chain as as3p1.py, but stored sparse
+    states = ["Waiting", "On Hold", "Talking", "Resolved", "Exit"]
+    P_small = to_sparse_transition_matrix([
+        [0.2, 0.3, 0.5, 0.0, 0.0],
+        [0.1, 0.4, 0.5, 0.0, 0.0],
+        [0.0, 0.1, 0.4, 0.5, 0.0],
+        [0.0, 0.0, 0.0, 0.0, 1.0],
+        [0.0, 0.0, 0.0, 0.0, 1.0],
+    ])
+    probs = propagate(P_small, [1, 0, 0, 0, 0], steps=5)
+    print("--- After 5 steps (starting at Waiting), sparse backend ---")
+    for name, prob in zip(states, probs):
+        print(f"Probability of being in '{name}': {prob:.4f}")
+
+    # 2. A large chain: reflecting random walk with 10^5 states
+    n_states = 100_000
+    p = 0.45
+    P_big = random_walk_chain(n_states, p)
+    validate_stochastic(P_big)
+    print(f"\n--- Random walk with {n_states} states, p = {p} ---")
+    print(f"Non-zeros stored: {P_big.nnz} (dense would need {n_states**2:.1e})")
+
+    # Start from state 0: the drift is toward 0, so the mass settles quickly
+    pi0 = np.zeros(n_states)
+    pi0[0] = 1.0
+    pi, info = stationary_distribution(P_big, method="power", tol=1e-12, pi0=pi0)
+    print(f"Power iteration: {info['iterations']} iterations, residual {info['residual']:.2e}")
+
+    pi_gmres, info = stationary_distribution(P_big, method="gmres", tol=1e-12)
+    print(f"GMRES + ILU:     {info['iterations']} iterations, residual {info['residual']:.2e}")
+    print(f"Max difference between the two solutions: {np.abs(pi - pi_gmres).max():.2e}")
+
+    # Theory: pi_i proportional to (p/q)^i for the reflecting walk
+    r = p / (1 - p)
+    theory = r ** np.arange(10)
+    theory = theory * (1 - r)
+    print("First 5 stationary probabilities (computed vs theory):")
+    for i in range(5):
+        print(f"  pi[{i}] = {pi[i]:.6f}   theory ~ {theory[i]:.6f}")
@@ -0,0 +1,229 @@
+import numpy as np
+import scipy.sparse as sp
+from scipy.stats import poisson
+
+# Transient analysis of continuous-time Markov chains by uniformization
+#
+# as3p2.py only compares the long-run L and W of the M/M/1 queue, and as3p3.py
+# looks at a single noisy birth-death path. Here the full state distribution
+# p(t) = p(0) exp(Qt) is computed at a whole grid of times in one deterministic
+# solve:
+#
+#   p(t) = sum_k  Poisson(k; Lambda*t) * p(0) P^k,    P = I + Q / Lambda
+#
+# where Lambda >= max_i |q_ii|. The vectors p(0) P^k are shared by every time
+# point, so the grid costs one pass of sparse mat-vec products.
+
+
+# --- Generators ---
+
+def birth_death_generator(birth_rates, death_rates):
+    """
+    Sparse generator of a birth-death chain on states 0..n-1.
+    birth_rates[i] is the rate i -> i+1 (i = 0..n-2),
+    death_rates[i] is the rate i+1 -> i (i = 0..n-2).
+    """
+    birth_rates = np.asarray(birth_rates, dtype=float)
+    death_rates = np.asarray(death_rates, dtype=float)
+    if birth_rates.shape != death_rates.shape:
+        raise ValueError("birth_rates and death_rates must have the same length")
+    if np.any(birth_rates < 0) or np.any(death_rates < 0):
+        raise ValueError("Rates must be non-negative")
+
+    n = birth_rates.size + 1
+    out_rate = np.zeros(n)
+    out_rate[:-1] += birth_rates
+    out_rate[1:] += death_rates
+    Q = sp.diags([death_rates, -out_rate, birth_rates], offsets=[-1, 0, 1],
+                 shape=(n, n), format="csr")
+    return Q
+
+
+def mmc_generator(lambd, mu, c, capacity):
+    """
+    Generator of an M/M/c queue truncated at `capacity` customers
+    (arrivals are lost when the system is full). States are 0..capacity.
+    """
+    if capacity < 1:
+        raise ValueError("capacity must be at least 1")
+    n_customers = np.arange(1, capacity + 1)
+    birth_rates = np.full(capacity, float(lambd))
+    death_rates = mu * np.minimum(n_customers, c)
+    return birth_death_generator(birth_rates, death_rates)
+
+
+def mm1_generator(lambd, mu, capacity):
+    """Generator of an M/M/1 queue truncated at `capacity` customers."""
+    return mmc_generator(lambd, mu, 1, capacity)
+
+
+def birth_death_stationary(Q):
+    """
+    Stationary distribution of a birth-death generator from the product form
+    pi_{i+1} / pi_i = birth_i / death_i (computed in log space to avoid overflow).
+
+    Links with a zero rate split the chain into segments. The product form is
+    applied on the single closed segment (one that can't be left) and the
+    transient states get pi = 0. Raises ValueError if there is more than one
+    closed segment, since then the stationary distribution is not unique.
+    """
+    Q = sp.csr_matrix(Q)
+    birth = Q.diagonal(1)
+    death = Q.diagonal(-1)
+    n = birth.size + 1
+
+    # Segment boundaries: links that can't be crossed in at least one direction
+    cuts = np.flatnonzero((birth == 0) | (death == 0))
+    starts = np.concatenate([[0], cuts + 1])
+    ends = np.concatenate([cuts, [n - 1]])
+    closed = [
+        (int(a), int(b)) for a, b in zip(starts, ends)
+        if (a == 0 or death[a - 1] == 0) and (b == n - 1 or birth[b] == 0)
+    ]
+    if len(closed) != 1:
+        raise ValueError(
+            f"Chain has {len(closed)} closed classes (state ranges {closed}), "
+            "so the stationary distribution is not unique"
+        )
+
+    a, b = closed[0]
+    log_ratio = np.log(birth[a:b]) - np.log(death[a:b])
+    log_pi = np.concatenate([[0.0], np.cumsum(log_ratio)])
+    pi = np.zeros(n)
+    pi[a:b + 1] = np.exp(log_pi - log_pi.max())
+    return pi / pi.sum()
+
+
+# --- Uniformization ---
+
+def transient_distribution(Q, p0, times, eps=1e-10):
+    """
+    State distribution p(t) for every t in `times`, using uniformization.
+
+    For each t the Poisson series is cut to the terms [L(t), R(t)] that carry
+    all but eps of the Poisson(Lambda*t) mass, so the number of terms adapts to
+    Lambda*t (about Lambda*t + O(sqrt(Lambda*t)) for large t).
+
+    Returns (probs, error_bound):
+      probs       - array of shape (len(times), n_states)
+      error_bound - per-time bound on the L1 error, i.e. the Poisson mass
+                    that was dropped (always <= eps)
+    """
+    Q = sp.csr_matrix(Q, dtype=float)
+    n = Q.shape[0]
+    times = np.atleast_1d(np.asarray(times, dtype=float))
+    if np.any(times < 0):
+        raise ValueError("times must be non-negative")
+
+    p = np.asarray(p0, dtype=float).ravel()
+    if p.shape[0] != n:
+        raise ValueError(f"p0 has {p.shape[0]} entries but Q has {n} states")
+
+    row_sums = np.asarray(Q.sum(axis=1)).ravel()
+    if np.abs(row_sums).max() > 1e-8 * max(1.0, np.abs(Q.diagonal()).max()):
+        raise ValueError("Rows of a generator must sum to 0")
+
+    Lambda = np.abs(Q.diagonal()).max()
+    probs = np.zeros((times.size, n))
+    if Lambda == 0:
+        # Nothing ever moves
+        probs[:] = p
+        return probs, np.zeros(times.size)
+
+    # Uniformized DTMC, transposed so that p P == PT @ p
+    PT = (sp.identity(n, format="csr") + Q / Lambda).T.tocsr()
+
+    # Truncation points for each time: keep [left, right] with eps/2 cut
+    # from each tail of Poisson(Lambda*t)
+    rates = Lambda * times
+    left = np.where(rates > 0, poisson.ppf(eps / 2, rates), 0).astype(int)
+    right = np.where(rates > 0, poisson.isf(eps / 2, rates), 0).astype(int)
+    left = np.maximum(left - 1, 0)
+    error_bound = (poisson.cdf(left - 1, rates) + poisson.sf(right, rates))
+
+    # One pass over k = 0..max(right): p P^k is added to every time point
+    # whose window [left, right] contains k
+    for k in range(right.max() + 1):
+        active = (left <= k) & (k <= right)
+        if np.any(active):
+            weights = poisson.pmf(k, rates[active])
+            probs[active] += weights[:, None] * p[None, :]
+        p = PT @ p
+
+    return probs, error_bound
+
+
+def time_to_steady_state(Q, p0, tol=0.01, t_max=None, n_points=200, eps=1e-10):
+    """
+    First time on a grid of n_points in [0, t_max] where the total variation
+    distance between p(t) and the stationary distribution drops below tol.
+    Returns (t_star, times, tv_distance); t_star is None if it is never reached.
+    Uses the birth-death product form for pi, so Q must be tridiagonal
+    (and have a unique stationary distribution, see birth_death_stationary).
+    """
+    pi = birth_death_stationary(Q)
+    if t_max is None:
+        holding_rates = np.abs(sp.csr_matrix(Q).diagonal())
+        if np.any(holding_rates == 0):
+            raise ValueError("Q has absorbing states, so t_max must be given explicitly")
+        # Default: 50 mean holding times of the slowest state. Slowly mixing
+        # chains (e.g. queues near rho = 1) need a larger t_max passed in
+        t_max = 50.0 / holding_rates.min()
+    times = np.linspace(0, t_max, n_points)
+    probs, _ = transient_distribution(Q, p0, times, eps=eps)
+    tv_distance = 0.5 * np.abs(probs - pi[None, :]).sum(axis=1)
+
+    below = np.flatnonzero(tv_distance < tol)
+    t_star = times[below[0]] if below.size > 0 else None
+    return t_star, times, tv_distance
+
+
+# --- Main script execution ---
+if __name__ == "__main__":
+    # 1. M/M/1 with the same parameters as as3p2.py, starting empty
+    lambd = 3.0
+    mu = 4.0
+    capacity = 100  # P(N >= 100) = rho^100 ~ 3e-13, so the truncation is harmless
+    Q = mm1_generator(lambd, mu, capacity)
+
+    p0 = np.zeros(capacity + 1)
+    p0[0] = 1.0
+    times = np.array([0.5, 1, 2, 5, 10, 20, 50, 100])
+    probs, err = transient_distribution(Q, p0, times)
+    states = np.arange(capacity + 1)
+
+    rho = lambd / mu
+    print(f"--- M/M/1 transient, Lambda={lambd}, Mu={mu}, starting empty ---")
+    print(f"Long-run L = rho / (1 - rho) = {rho / (1 - rho):.4f}")
+    for t, pt, e in zip(times, probs, err):
+        print(f"t = {t:6.1f}  E[N(t)] = {pt @ states:.4f}  P(empty) = {pt[0]:.4f}  (error <= {e:.1e})")
+
+    t_star, _, _ = time_to_steady_state(Q, p0, tol=0.01, t_max=200, n_points=400)
+    if t_star is None:
+        print("Not within 1% (total variation) of steady state by t = 200 mins")
+    else:
+        print(f"Time until within 1% (total variation) of steady state: {t_star:.2f} mins")
+
+    # 2. Staffing transient: M/M/c after a rush, 20 people waiting at t = 0
+    print("\n--- M/M/c: clearing a backlog of 20 customers (Lambda=3, Mu=1) ---")
+    for c in [4, 5, 6]:
+        Q_c = mmc_generator(3.0, 1.0, c, capacity=80)
+        p0_c = np.zeros(81)
+        p0_c[20] = 1.0
+        t_star, _, _ = time_to_steady_state(Q_c, p0_c, tol=0.01, t_max=100, n_points=500)
+        if t_star is None:
+            print(f"c = {c} servers: not within 1% of steady state by t = 100 mins")
+        else:
+            print(f"c = {c} servers: within 1% of steady state after {t_star:.2f} mins")
+
+    # 3. Linear birth-death process from as3p3.py (truncated at 200)
+    beta, delta, initial_pop, max_pop = 0.5, 0.5, 20, 200
+    pops = np.arange(max_pop)
+    Q_bd = birth_death_generator(beta * pops, delta * (pops + 1))
+    p0_bd = np.zeros(max_pop + 1)
+    p0_bd[initial_pop] = 1.0
+    t_grid = np.array([1, 5, 10, 20, 50])
+    probs_bd, _ = transient_distribution(Q_bd, p0_bd, t_grid)
+    print(f"\n--- Linear birth-death, beta={beta}, delta={delta}, N(0)={initial_pop} ---")
+    for t, pt in zip(t_grid, probs_bd):
+        print(f"t = {t:3d}  P(extinct) = {pt[0]:.4f}  E[N(t)] = {pt @ np.arange(max_pop + 1):.2f}")